@@ -14,6 +14,7 @@ import pydantic
 import uvicorn
 from context_retriever import doc_preparation_service
 from context_retriever import doc_retrieval_service
+from context_retriever import middleware
 from context_retriever.vector_store import qdrant as qdrant_vs
 from context_retriever.vector_store.core import EmbeddingModelCfg
 
@@ -72,6 +73,7 @@ async def lifespan(_):  # type: ignore
 
 
 app = fastapi.FastAPI(lifespan=lifespan)
+app.add_middleware(middleware.GzipRequestMiddleware)
 
 
 @app.get('/ping')
@@ -198,7 +200,9 @@ def main(cfg: omegaconf.DictConfig) -> None:
                 log_level='info',
                 access_log=True,
                 limit_concurrency=1000,
-                timeout_keep_alive=5)
+                timeout_keep_alive=5,
+                loop='uvloop',
+                http='httptools')
 
 
 if __name__ == '__main__':
@@ -1,6 +1,7 @@
 """Contains class for handling communication with Qdrant vector store."""
 import logging
 
+import numpy as np
 import pydantic
 import qdrant_client
 from context_retriever.vector_store import core as vs_core
@@ -55,7 +56,9 @@ class QdrantProxy(vs_core.VectorStoreProxy):
 
             self._client.upload_collection(
                 collection_name=self._cfg.collection_name,
-                vectors=embedded_docs,
+                # Qdrant stores float32 vectors; a contiguous float32 matrix uploads
+                # without the per-element boxing of nested Python float lists.
+                vectors=np.asarray(embedded_docs, dtype=np.float32),
                 payload=[{'content': doc.page_content,
                           'metadata': doc.metadata} for doc in batch_docs],
             )
@@ -1,4 +1,5 @@
 """"Starts the backend server for the entrypoint service."""
+import asyncio
 import json
 import logging
 import os
@@ -14,6 +15,7 @@ import pydantic
 import uvicorn
 from fastapi.responses import StreamingResponse
 from llm_proxy import chat_llm_service
+from llm_proxy import middleware
 
 
 def _logger() -> logging.Logger:
@@ -46,6 +48,7 @@ async def lifespan(_):  # type: ignore
 
 
 app = fastapi.FastAPI(lifespan=lifespan)
+app.add_middleware(middleware.GzipRequestMiddleware)
 
 
 @app.get('/ping')
@@ -81,7 +84,7 @@ async def stream_chat_response(request: RequestStreamChatResponse) -> StreamingR
         llm_service.stream_chat_response(request.conversation_state.user_message,
                                          chat_history=request.conversation_state.chat_history,
                                          context_documents=request.context_docs),
-        media_type='application/json')
+        media_type='application/x-ndjson')
 
 
 class ResponseInputCheck(pydantic.BaseModel):
@@ -105,6 +108,38 @@ async def check_input_safety(request: ConversationState) -> ResponseInputCheck:
     return ResponseInputCheck(is_ok=is_ok, reason=reason)
 
 
+class ResponseInputChecks(pydantic.BaseModel):
+    """Response containing the combined status of both input guardrail checks."""
+
+    safety: ResponseInputCheck
+    relevance: ResponseInputCheck
+
+
+@app.post('/check_input')
+async def check_input(request: ConversationState) -> ResponseInputChecks:
+    """Fires both input guardrails on the current conversation state in one round trip."""
+
+    assert llm_service is not None
+
+    # The two guardrails are independent LLM calls; running them concurrently
+    # shortens the pre-generation critical path to the slower of the two.
+    (safety_is_ok, safety_reason), (relevance_is_ok, relevance_reason) = await asyncio.gather(
+        llm_service.check_input_safety(
+            user_query=request.user_message,
+            chat_history=request.chat_history
+        ),
+        llm_service.check_input_relevance(
+            user_query=request.user_message,
+            chat_history=request.chat_history
+        )
+    )
+
+    return ResponseInputChecks(
+        safety=ResponseInputCheck(is_ok=safety_is_ok, reason=safety_reason),
+        relevance=ResponseInputCheck(is_ok=relevance_is_ok, reason=relevance_reason)
+    )
+
+
 @app.post('/check_input_relevance')
 async def check_input_relevance(request: ConversationState) -> ResponseInputCheck:
     """Fires the internal guardrails responsible for checking the relevance of the user input."""
@@ -183,7 +218,9 @@ def main(cfg: omegaconf.DictConfig) -> None:
                 log_level='info',
                 access_log=True,
                 limit_concurrency=1000,
-                timeout_keep_alive=5)
+                timeout_keep_alive=5,
+                loop='uvloop',
+                http='httptools')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+"""Contains ASGI middleware used by the server entrypoint."""
+import gzip
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+
+class GzipRequestMiddleware:
+    """Transparently decompresses gzip-encoded request bodies.
+
+    Clients may send `Content-Encoding: gzip` on large JSON payloads such as
+    long chat histories; Starlette does not decode request bodies natively, so
+    the body is inflated here before it reaches the endpoint parsers. Requests
+    without the header pass through untouched.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[Any]]) -> None:
+        self._app = app
+
+    async def __call__(self,
+                       scope: dict[str, Any],
+                       receive: Callable[[], Awaitable[dict[str, Any]]],
+                       send: Callable[..., Awaitable[Any]]) -> None:
+
+        if scope['type'] != 'http':
+            await self._app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+
+        if headers.get(b'content-encoding') != b'gzip':
+            await self._app(scope, receive, send)
+            return
+
+        compressed = bytearray()
+        more_body = True
+
+        while more_body:
+            message = await receive()
+            compressed.extend(message.get('body', b''))
+            more_body = message.get('more_body', False)
+
+        body = gzip.decompress(bytes(compressed))
+
+        scope = dict(scope)
+        scope['headers'] = [
+            (name, value) for name, value in scope['headers']
+            if name not in (b'content-encoding', b'content-length')
+        ] + [(b'content-length', str(len(body)).encode('latin-1'))]
+
+        body_replayed = False
+
+        async def replay_receive() -> dict[str, Any]:
+            # The inflated body is replayed exactly once; later calls fall
+            # through to the real receive so disconnect events still arrive.
+            nonlocal body_replayed
+
+            if not body_replayed:
+                body_replayed = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+
+            return await receive()
+
+        await self._app(scope, replay_receive, send)
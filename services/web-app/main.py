@@ -1,6 +1,8 @@
 """Contains the main entrypoint for the web application."""
+import atexit
 import logging.config
 import os
+import types
 from datetime import datetime
 
 import gradio as gr
@@ -21,14 +23,20 @@ def _logger() -> logging.Logger:
 def main(cfg: omegaconf.DictConfig) -> None:
     """Initializes and serves the web app."""
 
-    os.makedirs(os.path.join(cfg.persist_data_path, 'log'), exist_ok=True)
+    # Resolve the config once into a plain namespace; DictConfig attribute access
+    # goes through OmegaConf resolution on every read.
+    cfg_container = omegaconf.OmegaConf.to_container(cfg, resolve=True)
+    assert isinstance(cfg_container, dict)
+    cfg_ns = types.SimpleNamespace(**cfg_container)
+
+    os.makedirs(os.path.join(cfg_ns.persist_data_path, 'log'), exist_ok=True)
 
     logging.config.dictConfig({
         'version': 1,
         'loggers': {
             'root': {
                 'level': 'NOTSET',
-                'handlers': ['console', 'file'],
+                'handlers': ['console', 'file_queue'],
                 'propagate': True
             },
             'httpx': {
@@ -50,12 +58,20 @@ def main(cfg: omegaconf.DictConfig) -> None:
                 'class': 'logging.handlers.RotatingFileHandler',
                 'level': 'DEBUG',
                 'formatter': 'default',
-                'filename': os.path.join(cfg.persist_data_path,
+                'filename': os.path.join(cfg_ns.persist_data_path,
                                          'log',
                                          f'{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}.log'),
                 'maxBytes': 5_000_000,
                 'backupCount': 5,
                 'encoding': 'utf-8',
+            },
+            # Request threads only enqueue records; the file handler's disk I/O
+            # runs on the queue listener thread, which dictConfig creates but
+            # does not start — it is started explicitly below.
+            'file_queue': {
+                'class': 'logging.handlers.QueueHandler',
+                'handlers': ['file'],
+                'respect_handler_level': True
             }
         },
         'formatters': {
@@ -65,17 +81,22 @@ def main(cfg: omegaconf.DictConfig) -> None:
         }
     })
 
+    queue_listener = getattr(logging.getHandlerByName('file_queue'), 'listener', None)
+    if queue_listener is not None:
+        queue_listener.start()
+        atexit.register(queue_listener.stop)
+
     _logger().info('Starting web application with configuration:\n%s',
                    omegaconf.OmegaConf.to_yaml(cfg))
 
     _logger().info('Creating services for backend communication...')
 
     context_retriever_service = context_retriever.ContextRetrieverService(
-        endpoint_cfg=backend_utils.EndpointConnectionCfg(**cfg.context_retriever_cfg)
+        endpoint_cfg=backend_utils.EndpointConnectionCfg.from_dict(cfg_ns.context_retriever_cfg)
     )
 
     llm_proxy_service = llm_proxy.LLMProxyService(
-        endpoint_cfg=backend_utils.EndpointConnectionCfg(**cfg.llm_proxy_cfg)
+        endpoint_cfg=backend_utils.EndpointConnectionCfg.from_dict(cfg_ns.llm_proxy_cfg)
     )
 
     _logger().info('Rendering GUI...')
@@ -85,8 +106,8 @@ def main(cfg: omegaconf.DictConfig) -> None:
                    css=gui_utils.CUSTOM_CSS) as web_application:
         main_controller.MainController(context_retriever_service, llm_proxy_service).render_gui()
 
-    web_application.launch(server_name=cfg.web_app_host,
-                           server_port=cfg.web_app_port)
+    web_application.launch(server_name=cfg_ns.web_app_host,
+                           server_port=cfg_ns.web_app_port)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 """Contains the main entrypoint for the web application."""
 import logging.config
+import types
 
 import gradio as gr
 import hydra
@@ -21,6 +22,12 @@ with hydra.initialize(version_base=None, config_path='cfg'):
     _logger().info('Starting web application with configuration:\n%s',
                    omegaconf.OmegaConf.to_yaml(cfg))
 
+# Resolve the config once into a plain namespace; DictConfig attribute access
+# goes through OmegaConf resolution on every read.
+_cfg_container = omegaconf.OmegaConf.to_container(cfg, resolve=True)
+assert isinstance(_cfg_container, dict)
+cfg_ns = types.SimpleNamespace(**_cfg_container)
+
 logging.config.dictConfig({
     'version': 1,
     'loggers': {
@@ -49,15 +56,15 @@ logging.config.dictConfig({
 })
 
 context_retriever_service = context_retriever.ContextRetrieverService(
-    endpoint_cfg=backend_utils.EndpointConnectionCfg(**cfg.context_retriever_cfg)
+    endpoint_cfg=backend_utils.EndpointConnectionCfg.from_dict(cfg_ns.context_retriever_cfg)
 )
 
 llm_proxy_service = llm_proxy.LLMProxyService(
-    endpoint_cfg=backend_utils.EndpointConnectionCfg(**cfg.llm_proxy_cfg)
+    endpoint_cfg=backend_utils.EndpointConnectionCfg.from_dict(cfg_ns.llm_proxy_cfg)
 )
 
 with gr.Blocks(fill_height=True, title='AGH Chat', css=gui_utils.CUSTOM_CSS) as web_application:
     main_controller.MainController(context_retriever_service, llm_proxy_service).render_gui()
 
-web_application.launch(server_name=cfg.web_app_host,
-                       server_port=cfg.web_app_port)
+web_application.launch(server_name=cfg_ns.web_app_host,
+                       server_port=cfg_ns.web_app_port)
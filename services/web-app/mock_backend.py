@@ -1,8 +1,8 @@
 """Mock backend service for testing the web application."""
 import asyncio
-import json
 import logging
 import random
+import types
 from typing import Any
 from typing import AsyncIterator
 from typing import Dict
@@ -11,6 +11,7 @@ from typing import List
 import fastapi
 import hydra
 import omegaconf
+import orjson
 import pydantic
 import uvicorn
 from fastapi.responses import StreamingResponse
@@ -34,35 +35,37 @@ class RequestStreamChatResponse(pydantic.BaseModel):
     context_docs: list[dict[str, Any]]
 
 
+_MOCK_RESPONSE = """Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod
+tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud
+exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor
+in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur
+sint occaecat cupidatat non proident, sunt in culpa qui officia deserunt mollit anim id est
+laborum."""
+
+_MOCK_WORDS = _MOCK_RESPONSE.split()
+
+
 @app.post('/stream_chat_response')
 async def stream_chat_response(request: RequestStreamChatResponse) -> StreamingResponse:
     """"""
 
-    mock_response = """Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod
-    tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud
-    exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor
-    in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur
-    sint occaecat cupidatat non proident, sunt in culpa qui officia deserunt mollit anim id est
-    laborum."""
-
-    mock_words = mock_response.split()
-
-    response = ' '.join(random.sample(mock_words, len(mock_words)))
+    response = ' '.join(random.sample(_MOCK_WORDS, len(_MOCK_WORDS)))
     response += f'Documents used: {[doc["metadata"]["title"] for doc in request.context_docs]}'
 
+    words = response.split(' ')
+    tokens = words[:1] + [f' {word}' for word in words[1:]]
+
     async def event_generator() -> AsyncIterator[bytes]:
 
         if 'fail' in request.conversation_state.user_message.lower():
-            chunk = {'error': 'Simulated backend failure.'}
-            yield json.dumps(chunk).encode('utf-8')
+            yield orjson.dumps({'error': 'Simulated backend failure.'}) + b'\n'
             return
 
-        for token in response.replace(' ', ' [split_token]') .split('[split_token]'):
-            chunk = {'content': token}
-            yield json.dumps(chunk).encode('utf-8')
+        for token in tokens:
+            yield orjson.dumps({'content': token}) + b'\n'
             await asyncio.sleep(0.05)
 
-    return StreamingResponse(event_generator(), media_type='application/json')
+    return StreamingResponse(event_generator(), media_type='application/x-ndjson')
 
 
 class ResponseInputCheck(pydantic.BaseModel):
@@ -80,6 +83,21 @@ async def check_input_safety(request: ConversationState) -> ResponseInputCheck:
     return ResponseInputCheck(is_ok=True)
 
 
+class ResponseInputChecks(pydantic.BaseModel):
+
+    safety: ResponseInputCheck
+    relevance: ResponseInputCheck
+
+
+@app.post('/check_input')
+async def check_input(request: ConversationState) -> ResponseInputChecks:
+
+    safety, relevance = await asyncio.gather(check_input_safety(request),
+                                             check_input_relevance(request))
+
+    return ResponseInputChecks(safety=safety, relevance=relevance)
+
+
 @app.post('/check_input_relevance')
 async def check_input_relevance(request: ConversationState) -> ResponseInputCheck:
 
@@ -99,6 +117,22 @@ class ResponseCollectContextInfo(pydantic.BaseModel):
     context_docs: list[dict[str, Any]]
 
 
+_MOCK_DOCS = (
+    {'content': 'This is document 1', 'metadata': {
+        'title': 'Document 1',
+        'author': 'Author A',
+        'page': '1'}},
+    {'content': 'This is document 2', 'metadata': {
+        'title': 'Document 2',
+        'author': 'Author B',
+        'page': '2'}},
+    {'content': 'This is document 3', 'metadata': {
+        'title': 'Document 3',
+        'author': 'Author C',
+        'page': '3'}},
+)
+
+
 @app.post('/collect_context_info')
 async def collect_context_info(request: RequestCollectContextInfo) -> ResponseCollectContextInfo:
 
@@ -106,22 +140,7 @@ async def collect_context_info(request: RequestCollectContextInfo) -> ResponseCo
 
     logging.info('/collect_context_info - Message: %s', request.user_message)
 
-    mock_docs = [
-        {'content': 'This is document 1', 'metadata': {
-            'title': 'Document 1',
-            'author': 'Author A',
-            'page': '1'}},
-        {'content': 'This is document 2', 'metadata': {
-            'title': 'Document 2',
-            'author': 'Author B',
-            'page': '2'}},
-        {'content': 'This is document 3', 'metadata': {
-            'title': 'Document 3',
-            'author': 'Author C',
-            'page': '3'}},
-    ]
-
-    return ResponseCollectContextInfo(context_docs=random.sample(mock_docs, 2))
+    return ResponseCollectContextInfo(context_docs=random.sample(_MOCK_DOCS, 2))
 
 
 class ResponseUploadDocument(pydantic.BaseModel):
@@ -144,11 +163,15 @@ def main(cfg: omegaconf.DictConfig) -> None:
     logging.info('Starting mock backend with configuration:\n%s',
                  omegaconf.OmegaConf.to_yaml(cfg))
 
+    cfg_ns = types.SimpleNamespace(**omegaconf.OmegaConf.to_container(cfg, resolve=True))
+
     uvicorn.run(
         'mock_backend:app',
-        host=cfg.host,
-        port=cfg.port,
-        reload=False
+        host=cfg_ns.host,
+        port=cfg_ns.port,
+        reload=False,
+        loop='uvloop',
+        http='httptools'
     )
 
 
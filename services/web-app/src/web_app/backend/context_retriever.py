@@ -2,7 +2,9 @@
 import logging
 
 import magic
+import orjson
 import requests
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 from web_app.backend import utils
 
 
@@ -10,16 +12,48 @@ def _logger() -> logging.Logger:
     return logging.getLogger(__name__)
 
 
+_MIME_MAGIC: magic.Magic | None = None
+
+
+def _detect_mime(file_path: str) -> str:
+    """Detects the MIME type of a file.
+
+    PDFs — the only accepted type — are recognized from their 4-byte header
+    without touching libmagic; other files fall back to a lazily created,
+    reused magic.Magic instance, so the magic database is parsed at most once
+    per process instead of on every upload.
+    """
+
+    with open(file_path, 'rb') as file:
+        if file.read(4) == b'%PDF':
+            return 'application/pdf'
+
+    global _MIME_MAGIC  # pylint: disable=global-statement
+
+    if _MIME_MAGIC is None:
+        _MIME_MAGIC = magic.Magic(mime=True)
+
+    return str(_MIME_MAGIC.from_file(file_path))
+
+
 class ContextRetrieverService:
     """Communicates with the context-retriever module and retrieves context for queries."""
 
     def __init__(self, endpoint_cfg: utils.EndpointConnectionCfg):
 
         self._endpoint_cfg = endpoint_cfg
+        self._session = utils.create_pooled_session()
+
+        self._collect_url = f'{endpoint_cfg.url}/collect_context_info'
+        self._upload_pdf_url = f'{endpoint_cfg.url}/upload_pdf'
 
         _logger().info('Created service for context-retriever with cfg: %s',
                        endpoint_cfg)
 
+    def close(self) -> None:
+        """Closes the pooled HTTP session."""
+        self._session.close()
+
     def collect_context_info(self,
                              user_message: str,
                              chat_history: utils.ChatHistory) -> list[utils.ContextDocument]:
@@ -36,16 +70,19 @@ class ContextRetrieverService:
         _logger().debug('Collecting context info with user_message: %s and chat_history: %s',
                         user_message, chat_history)
 
-        url = f"{self._endpoint_cfg.url}/collect_context_info"
-        payload = {
-            'user_message': user_message,
-            'chat_history': utils.chat_history_to_payload(chat_history)
-        }
+        body = utils.conversation_state_payload_bytes(user_message, chat_history)
+        headers = utils.JSON_HEADERS
 
-        response = requests.post(url, json=payload, timeout=self._endpoint_cfg.connection_timeout)
+        if self._endpoint_cfg.compress_requests:
+            body, headers = utils.maybe_compress(body, headers)
+
+        response = self._session.post(self._collect_url,
+                                      data=body,
+                                      headers=headers,
+                                      timeout=self._endpoint_cfg.timeouts)
         response.raise_for_status()
 
-        response_data = response.json()
+        response_data = orjson.loads(response.content)
 
         return [utils.ContextDocument(doc['content'], doc['metadata'])
                 for doc in response_data['context_docs']]
@@ -63,20 +100,22 @@ class ContextRetrieverService:
 
         _logger().debug('Uploading file %s to context retriever service.', uploaded_file_path)
 
-        mime = magic.from_file(uploaded_file_path, mime=True)
-
-        if mime == 'application/pdf':
-            url = f"{self._endpoint_cfg.url}/upload_pdf"
+        mime = _detect_mime(uploaded_file_path)
 
-        else:
+        if mime != 'application/pdf':
             return 'Only PDF files are supported.'
 
         try:
             with open(uploaded_file_path, 'rb') as file:
-                response = requests.post(
-                    url,
-                    files={'file': (uploaded_file_path, file, mime)},
-                    timeout=self._endpoint_cfg.connection_timeout
+                # The streaming encoder sends the file in fixed-size chunks, so
+                # memory stays O(chunk) instead of O(file) for large PDFs.
+                encoder = MultipartEncoder(fields={'file': (uploaded_file_path, file, mime)})
+
+                response = self._session.post(
+                    self._upload_pdf_url,
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    timeout=self._endpoint_cfg.timeouts
                 )
 
         except requests.exceptions.ConnectionError as e:
@@ -1,9 +1,13 @@
 """Contains service that communicates with the llm-proxy module."""
-import json
+import collections
 import logging
-from typing import Iterator
+import re
+import threading
+import time
+from typing import AsyncIterator
 
 import httpx
+import orjson
 import requests
 from web_app.backend import utils
 
@@ -12,20 +16,73 @@ def _logger() -> logging.Logger:
     return logging.getLogger(__name__)
 
 
+_CONTENT_CHUNK_RE = re.compile(rb'^\{"content":"((?:[^"\\]|\\.)*)"\}$')
+
+
+def _parse_stream_chunk(line: bytes) -> dict[str, str]:
+    """Parses a single NDJSON chunk of the chat stream.
+
+    Almost every chunk has the exact shape {"content":"..."}, so plain content
+    without escapes is extracted directly instead of deserializing the whole
+    object; anything else (escapes, error chunks) falls back to a full parse.
+    """
+
+    match = _CONTENT_CHUNK_RE.match(line)
+
+    if match is not None and b'\\' not in match.group(1):
+        return {'content': match.group(1).decode('utf-8')}
+
+    parsed: dict[str, str] = orjson.loads(line)
+    return parsed
+
+
 class LLMProxyService:
     """Communicates with the llm-proxy module and returns model's responses."""
 
+    _CHECK_CACHE_MAX_ENTRIES = 1024
+    _CHECK_CACHE_TTL_SECONDS = 300.0
+
     def __init__(self, endpoint_cfg: utils.EndpointConnectionCfg):
 
         self._endpoint_cfg = endpoint_cfg
+        self._session = utils.create_pooled_session()
+
+        self._stream_url = f'{endpoint_cfg.url}/stream_chat_response'
+        self._check_input_url = f'{endpoint_cfg.url}/check_input'
+        self._check_safety_url = f'{endpoint_cfg.url}/check_input_safety'
+        self._check_relevance_url = f'{endpoint_cfg.url}/check_input_relevance'
+
+        # Guardrail verdicts for an identical conversation state are stable for
+        # minutes, so resubmits and retries skip the HTTP round trip entirely.
+        self._check_cache: collections.OrderedDict[tuple[str, bytes],
+                                                   tuple[float, bytes]] = collections.OrderedDict()
+        self._check_cache_lock = threading.Lock()
+
+        # A long-lived async client keeps the connection to the llm-proxy warm
+        # between chat turns instead of paying a handshake on every stream, and
+        # lets the event loop serve other sessions while a stream is idle.
+        self._stream_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=httpx.Timeout(endpoint_cfg.connection_timeout,
+                                  connect=endpoint_cfg.connect_timeout)
+        )
 
         _logger().info('Created service for llm-proxy with cfg: %s',
                        endpoint_cfg)
 
-    def stream_chat_response(self,
-                             user_message: str,
-                             chat_history: utils.ChatHistory,
-                             context_docs: list[utils.ContextDocument]) -> Iterator[dict[str, str]]:
+    def close(self) -> None:
+        """Closes the pooled HTTP session."""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Closes the async streaming client."""
+        await self._stream_client.aclose()
+
+    async def stream_chat_response(
+            self,
+            user_message: str,
+            chat_history: utils.ChatHistory,
+            context_docs: list[utils.ContextDocument]) -> AsyncIterator[dict[str, str]]:
         """Collects LLM response based on the context and streams it.
 
         Args:
@@ -42,21 +99,65 @@ class LLMProxyService:
                          'chat_history: %s, context_docs: %s'),
                         user_message, chat_history, context_docs)
 
-        url = f"{self._endpoint_cfg.url}/stream_chat_response"
+        body = (b'{"conversation_state":'
+                + utils.conversation_state_payload_bytes(user_message, chat_history)
+                + b',"context_docs":'
+                + orjson.dumps(utils.context_docs_to_payload(context_docs))
+                + b'}')
+
+        headers = utils.JSON_HEADERS
+
+        if self._endpoint_cfg.compress_requests:
+            body, headers = utils.maybe_compress(body, headers)
+
+        async with self._stream_client.stream('POST', self._stream_url,
+                                              content=body,
+                                              headers=headers) as stream:
+            # The llm-proxy emits newline-delimited JSON; framing on a single
+            # reused bytearray keeps the parse correct when TCP chunks are
+            # split or coalesced, without allocating a str per chunk.
+            buffer = bytearray()
+
+            async for chunk in stream.aiter_bytes():
+                buffer.extend(chunk)
+
+                while (newline := buffer.find(b'\n')) != -1:
+                    line = bytes(buffer[:newline])
+                    del buffer[:newline + 1]
+
+                    if not line:
+                        continue
+
+                    yield _parse_stream_chunk(line)
+
+    def check_input(self,
+                    user_message: str,
+                    chat_history: utils.ChatHistory,
+                    ) -> tuple[utils.InputCheckResult, utils.InputCheckResult]:
+        """Runs both input guardrail checks in a single llm-proxy round trip.
 
-        payload = {
-            'conversation_state': {
-                'user_message': user_message,
-                'chat_history': utils.chat_history_to_payload(chat_history)
-            },
-            'context_docs': utils.context_docs_to_payload(context_docs)
-        }
+        Raises:
+            requests.HTTPError: If the request to the llm-proxy fails.
+
+        Returns:
+            A tuple with the safety and relevance check results.
+        """
+
+        _logger().debug(('Checking input with user_message: %s, chat_history: %s'),
+                        user_message, chat_history)
+
+        resp_json = orjson.loads(self._post_conversation_state(
+            user_message=user_message,
+            chat_history=chat_history,
+            url=self._check_input_url
+        ))
 
-        with httpx.stream('POST', url,
-                          json=payload,
-                          timeout=self._endpoint_cfg.connection_timeout) as stream:
-            for chunk in stream.iter_bytes():
-                yield json.loads(chunk.decode('utf-8'))
+        return (
+            utils.InputCheckResult(is_ok=resp_json['safety']['is_ok'],
+                                   reason=resp_json['safety']['reason']),
+            utils.InputCheckResult(is_ok=resp_json['relevance']['is_ok'],
+                                   reason=resp_json['relevance']['reason'])
+        )
 
     def check_input_safety(self,
                            user_message: str,
@@ -74,7 +175,7 @@ class LLMProxyService:
         return self._sanitize_input(
             user_message=user_message,
             chat_history=chat_history,
-            url=f"{self._endpoint_cfg.url}/check_input_safety"
+            url=self._check_safety_url
         )
 
     def check_input_relevance(self,
@@ -93,7 +194,7 @@ class LLMProxyService:
         return self._sanitize_input(
             user_message=user_message,
             chat_history=chat_history,
-            url=f"{self._endpoint_cfg.url}/check_input_relevance"
+            url=self._check_relevance_url
         )
 
     def _sanitize_input(self,
@@ -103,15 +204,45 @@ class LLMProxyService:
                         ) -> utils.InputCheckResult:
         """Sends the conversations state to a chosen llm-proxy guardrail endpoints."""
 
-        payload = {
-            'user_message': user_message,
-            'chat_history': utils.chat_history_to_payload(chat_history)
-        }
+        raw_response = self._post_conversation_state(user_message=user_message,
+                                                     chat_history=chat_history,
+                                                     url=url)
+
+        return utils.InputCheckResult.from_bytes(raw_response)
+
+    def _post_conversation_state(self,
+                                 user_message: str,
+                                 chat_history: utils.ChatHistory,
+                                 url: str,
+                                 ) -> bytes:
+        """Posts the conversation state to the given llm-proxy endpoint.
+
+        Returns the raw response body; callers parse it into their typed result
+        directly. Bodies are cached per (endpoint, payload) with a bounded TTL,
+        so re-checking an unchanged conversation state costs no round trip, and
+        the cached bytes are immutable and safe to share across threads.
+        """
+
+        body = utils.conversation_state_payload_bytes(user_message, chat_history)
+        headers = utils.JSON_HEADERS
+
+        cache_key = (url, body)
+
+        with self._check_cache_lock:
+            cached = self._check_cache.get(cache_key)
+
+            if cached is not None and time.monotonic() - cached[0] < self._CHECK_CACHE_TTL_SECONDS:
+                self._check_cache.move_to_end(cache_key)
+                return cached[1]
+
+        if self._endpoint_cfg.compress_requests:
+            body, headers = utils.maybe_compress(body, headers)
 
         try:
-            response = requests.post(url,
-                                     json=payload,
-                                     timeout=self._endpoint_cfg.connection_timeout)
+            response = self._session.post(url,
+                                          data=body,
+                                          headers=headers,
+                                          timeout=self._endpoint_cfg.timeouts)
 
         except requests.exceptions.ConnectionError as e:
             _logger().error('Connection error while connecting to llm-proxy: %s', e)
@@ -119,5 +250,13 @@ class LLMProxyService:
 
         response.raise_for_status()
 
-        resp_json = response.json()
-        return utils.InputCheckResult(is_ok=resp_json['is_ok'], reason=resp_json['reason'])
+        raw_response = response.content
+
+        with self._check_cache_lock:
+            self._check_cache[cache_key] = (time.monotonic(), raw_response)
+            self._check_cache.move_to_end(cache_key)
+
+            while len(self._check_cache) > self._CHECK_CACHE_MAX_ENTRIES:
+                self._check_cache.popitem(last=False)
+
+        return raw_response
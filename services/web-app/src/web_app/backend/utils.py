@@ -1,19 +1,44 @@
 """Contains utilities used by the backend services."""
 import dataclasses
+import gzip
+import socket
 from typing import Any
 from typing import TypeAlias
 
-import pydantic
+import orjson
+import requests
+import requests.adapters
+import urllib3
 
+JSON_HEADERS = {'Content-Type': 'application/json'}
 
-class EndpointConnectionCfg(pydantic.BaseModel):
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class EndpointConnectionCfg:
     """Configuration for connecting to a backend endpoint."""
 
     url: str
     connection_timeout: float
+    connect_timeout: float = 1.0
+    compress_requests: bool = False
+
+    @classmethod
+    def from_dict(cls, cfg: dict[str, Any]) -> 'EndpointConnectionCfg':
+        """Creates a config from a plain mapping, e.g. a resolved Hydra section."""
+        return cls(**cfg)
+
+    @property
+    def timeouts(self) -> tuple[float, float]:
+        """Returns the (connect, read) timeout pair for requests-style calls.
 
+        A short connect timeout fails fast on dead hosts instead of hanging for
+        the full read timeout.
+        """
 
-@dataclasses.dataclass
+        return self.connect_timeout, self.connection_timeout
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class ChatMessage:
     """Represents a single chat message."""
 
@@ -21,14 +46,50 @@ class ChatMessage:
     content: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ChatHistory:
-    """Contains history of messages in a chat session."""
+    """Contains history of messages in a chat session.
+
+    Messages may only be appended; earlier entries are assumed immutable, which
+    lets `payload_bytes` reuse the serialized prefix across turns. The class is
+    slotted but not frozen because the payload cache is updated in place.
+    """
 
     messages: list[ChatMessage]
 
+    _payload_cache: bytes | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False)
+    _payload_cache_len: int = dataclasses.field(
+        default=0, init=False, repr=False, compare=False)
+
+    def payload_bytes(self) -> bytes:
+        """Returns the messages serialized as a JSON array, cached per instance.
+
+        Within a turn the same history is posted to several endpoints; across
+        turns only the suffix for newly appended messages is serialized and
+        spliced onto the cached prefix.
+        """
+
+        if self._payload_cache is not None and self._payload_cache_len == len(self.messages):
+            return self._payload_cache
+
+        if self._payload_cache is not None and 0 < self._payload_cache_len < len(self.messages):
+            tail = b','.join(orjson.dumps({'role': message.role, 'content': message.content})
+                             for message in self.messages[self._payload_cache_len:])
+
+            payload = self._payload_cache[:-1] + b',' + tail + b']'
+
+        else:
+            payload = orjson.dumps([{'role': message.role, 'content': message.content}
+                                    for message in self.messages])
 
-@dataclasses.dataclass
+        self._payload_cache = payload
+        self._payload_cache_len = len(self.messages)
+
+        return payload
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class ContextDocument:
     """Represents a single document retrieved from the doc store."""
 
@@ -36,29 +97,70 @@ class ContextDocument:
     metadata: dict[str, Any]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class InputCheckResult:
     """Result of input safety, or relevance check."""
 
     is_ok: bool
     reason: str
 
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'InputCheckResult':
+        """Builds a result straight from a JSON response body.
 
-UnstructuredChatHistory: TypeAlias = list[dict[str, str]]
+        Parsing the raw bytes with orjson and constructing the dataclass in one
+        step avoids the bytes -> str -> dict detour of response.json().
+        """
 
-UnstructuredContextDocs: TypeAlias = list[dict[str, Any]]
+        parsed = orjson.loads(payload)
+        return cls(is_ok=parsed['is_ok'], reason=parsed['reason'])
 
 
-def chat_history_to_payload(chat_history: ChatHistory) -> UnstructuredChatHistory:
-    """Converts chat history into json representation containing only core fields."""
-    return [
-        {
-            'role': message.role,
-            'content': message.content
-        }
-        for message in chat_history.messages
+class _SocketOptionsAdapter(requests.adapters.HTTPAdapter):
+    """HTTP adapter that applies low-latency socket options to pooled connections.
+
+    TCP_NODELAY avoids Nagle-induced delays on the small POST bodies sent over
+    keep-alive connections; SO_KEEPALIVE lets dead pooled connections be
+    detected.
+    """
+
+    _SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
     ]
 
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs['socket_options'] = self._SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_pooled_session(pool_size: int = 50) -> requests.Session:
+    """Creates a session with a keep-alive connection pool and a retry policy.
+
+    Reusing pooled connections avoids a full TCP (and TLS) handshake on every
+    backend call.
+    """
+
+    session = requests.Session()
+
+    adapter = _SocketOptionsAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=urllib3.util.Retry(total=3,
+                                       backoff_factor=0.2,
+                                       status_forcelist=(502, 503, 504))
+    )
+
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+UnstructuredChatHistory: TypeAlias = list[dict[str, str]]
+
+UnstructuredContextDocs: TypeAlias = list[dict[str, Any]]
+
 
 def context_docs_to_payload(context_docs: list[ContextDocument]) -> UnstructuredContextDocs:
     """Converts context docs into json representation."""
@@ -70,3 +172,31 @@ def context_docs_to_payload(context_docs: list[ContextDocument]) -> Unstructured
         }
         for doc in context_docs
     ]
+
+
+def conversation_state_payload_bytes(user_message: str, chat_history: ChatHistory) -> bytes:
+    """Builds the serialized {user_message, chat_history} payload.
+
+    The chat history part comes from the per-instance cache, so posting the
+    same state to several endpoints serializes the history once at most.
+    """
+
+    return (b'{"user_message":' + orjson.dumps(user_message) +
+            b',"chat_history":' + chat_history.payload_bytes() + b'}')
+
+
+_COMPRESSION_MIN_BYTES = 1024
+
+
+def maybe_compress(body: bytes, headers: dict[str, str]) -> tuple[bytes, dict[str, str]]:
+    """Gzip-compresses a request body when it is large enough to benefit.
+
+    Chat histories grow linearly with the conversation and are highly
+    repetitive, so they compress well. Bodies below the threshold are returned
+    unchanged, since compressing tiny payloads costs more than it saves.
+    """
+
+    if len(body) < _COMPRESSION_MIN_BYTES:
+        return body, headers
+
+    return gzip.compress(body, compresslevel=3), {**headers, 'Content-Encoding': 'gzip'}
@@ -1,5 +1,9 @@
 """Contains GUI related utils."""
+import collections
+import io
 import logging
+import time
+from typing import AsyncIterator
 from typing import Iterator
 
 import gradio as gr
@@ -9,24 +13,38 @@ from web_app.backend import llm_proxy
 from web_app.backend import utils
 
 
-def _logger() -> logging.Logger:
-    return logging.getLogger(__name__)
+# Resolved once at import; logging.getLogger takes the module lock and walks
+# the logger registry on every call, which the error paths don't need to pay.
+_LOG = logging.getLogger(__name__)
 
+# Static layout strings are built once at import instead of on every
+# render_gui call (hot reload, multiple tabs).
+_CONTEXT_HEADER_MD = """
+# Context
+"""
 
-class MainController:
-    """Renders GUI elements and handles controller-view interactions."""
+_RETRIEVED_DOCS_HEADER_MD = """
+## Retrieved Documents
+"""
 
-    _DOC_MD_TEMPLATE = """
-### {title}
+_DOCS_PLACEHOLDER_MD = 'Retrieved documents will be displayed here.'
 
-{content}
-"""
 
-    _DOCS_LIST_MD_TEMPLATE = """
-## Round {round_nr}
+class MainController:
+    """Renders GUI elements and handles controller-view interactions."""
 
-{docs}
-"""
+    # Streamed tokens are coalesced before each GUI update: the first token is
+    # flushed immediately for fast time-to-first-byte, then the batch size grows
+    # geometrically up to the cap, with a time bound so slow generation still
+    # renders promptly.
+    _STREAM_BATCH_GROWTH_FACTOR = 3
+    _STREAM_MAX_BATCH_CHUNKS = 32
+    _STREAM_FLUSH_INTERVAL_SECONDS = 0.05
+
+    _CTX_CACHE_MAX_ENTRIES = 64
+    # Retrieval only looks at the recent conversation, so the cache key covers
+    # the last few messages rather than the whole history.
+    _CTX_CACHE_KEY_HISTORY_LEN = 4
 
     def __init__(self,
                  context_retriever_service: context_retriever.ContextRetrieverService,
@@ -37,17 +55,37 @@ class MainController:
 
         self._documents_retrieval_history: list[list[utils.ContextDocument]] = []
 
+        # Markdown block per retrieval round, rendered once when the round is
+        # stored; the docs panel is a join of these instead of re-formatting
+        # the whole history every turn.
+        self._rendered_round_reprs: list[str] = []
+
+        # Dirty flag plus cached joined Markdown: when no retrieval happened
+        # since the last render, the panel callback returns the cached string
+        # and Gradio has nothing new to diff.
+        self._docs_dirty = False
+        self._docs_md_cache = ''
+
+        # Structured mirror of the completed chat turns, extended in place when
+        # a response finishes instead of being rebuilt from the raw history on
+        # every callback; reusing one instance also keeps its serialized
+        # payload prefix cache warm across turns.
+        self._structured_chat_history = utils.ChatHistory([])
+
+        # Retrieval results for a repeated (message, recent history) pair are
+        # deterministic for a given index snapshot, so duplicate questions skip
+        # the synchronous retriever round trip that dominates time-to-first-token.
+        self._ctx_cache: collections.OrderedDict[
+            tuple[str, tuple[tuple[str, int], ...]],
+            list[utils.ContextDocument]] = collections.OrderedDict()
+
     def render_gui(self) -> None:
         """Renders the UI for application and assigns the necessary callbacks."""
 
         with gr.Row(elem_id='agh_header_row', height='70vh'):
 
             with gr.Column(elem_id='context_column', scale=1):
-                gr.Markdown(
-                    """
-                    # Context
-                    """
-                )
+                gr.Markdown(_CONTEXT_HEADER_MD)
 
                 file_upload = gr.File(label='Upload Files for Context')
 
@@ -55,17 +93,13 @@ class MainController:
                     self._upload_file, file_upload, file_upload,
                 )
 
-                gr.Markdown(
-                    """
-                    ## Retrieved Documents
-                    """
-                )
+                gr.Markdown(_RETRIEVED_DOCS_HEADER_MD)
 
                 with gr.Column(elem_id='retrieved_docs',
                                variant='panel',
                                elem_classes='retrieved-docs'):
 
-                    docs_list = gr.Markdown('Retrieved documents will be displayed here.')
+                    docs_list = gr.Markdown(_DOCS_PLACEHOLDER_MD)
 
             with gr.Column(elem_id='chat_column', scale=3):
 
@@ -90,59 +124,135 @@ class MainController:
                     self._create_retrieved_docs_representation, None, docs_list
                 )
 
-    def _stream_chat_response(self,
-                              chat_history: utils.UnstructuredChatHistory,
-                              ) -> Iterator[utils.UnstructuredChatHistory]:
-        """Streams the chat response based on the chat history with the latest user msg."""
+    async def _stream_chat_response(self,
+                                    chat_history: utils.UnstructuredChatHistory,
+                                    ) -> AsyncIterator[utils.UnstructuredChatHistory]:
+        """Streams the chat response based on the chat history with the latest user msg.
+
+        Runs as an async generator so the llm-proxy stream is awaited on
+        Gradio's event loop instead of tying up a worker thread per chat.
+        """
 
         chat_history, user_message = chat_history[:-1], chat_history[-1]['content']
 
-        structured_history = utils.ChatHistory(
-            [utils.ChatMessage(message['role'], message['content'])
-             for message in chat_history]
-        )
+        structured_history = self._structured_history_for(chat_history)
+
+        # Tokens accumulate in one amortized-growth bytearray and only become a
+        # str when a flush actually hands the text to Gradio. Tokens are always
+        # complete strings, so every extend is UTF-8 boundary-aligned.
+        response_buffer = bytearray()
+
+        # Gradio serializes each yield immediately, so the same history list and
+        # assistant dict can be reused across flushes with only the content
+        # field reassigned, instead of rebuilding both per flush.
+        assistant_msg = {'role': 'assistant', 'content': ''}
+        updated_history = chat_history + [{'role': 'user', 'content': user_message},
+                                          assistant_msg]
 
-        full_response = ''
+        pending_chunks = 0
+        next_flush = 1
+        last_flush = time.monotonic()
 
-        for chunk in self._llm_proxy_service.stream_chat_response(
+        async for chunk in self._llm_proxy_service.stream_chat_response(
             user_message=user_message,
             chat_history=structured_history,
             context_docs=self._documents_retrieval_history[-1]
         ):
 
             if 'error' in chunk:
-                _logger().debug('Received error from llm-proxy: %s', chunk['error'])
+                _LOG.debug('Received error from llm-proxy: %s', chunk['error'])
 
                 yield chat_history
                 self._documents_retrieval_history.pop()
+                self._rendered_round_reprs.pop()
+                self._docs_dirty = True
 
                 raise gr.Error(chunk['error'],
                                title='Error while generating chat response',
                                duration=None)
 
-            full_response += chunk['content']
+            response_buffer.extend(chunk['content'].encode('utf-8'))
+            pending_chunks += 1
+
+            now = time.monotonic()
+
+            if (pending_chunks < next_flush
+                    and now - last_flush < self._STREAM_FLUSH_INTERVAL_SECONDS):
+                continue
+
+            assistant_msg['content'] = response_buffer.decode('utf-8')
+            yield updated_history
+
+            pending_chunks = 0
+            next_flush = min(self._STREAM_MAX_BATCH_CHUNKS,
+                             next_flush * self._STREAM_BATCH_GROWTH_FACTOR)
+            last_flush = now
+
+        if pending_chunks:
+            assistant_msg['content'] = response_buffer.decode('utf-8')
+            yield updated_history
 
-            yield chat_history + [{'role': 'user', 'content': user_message},
-                                  {'role': 'assistant', 'content': full_response}]
+        # The turn completed, so it becomes part of the structured history;
+        # appending in place preserves the serialized prefix cache. The last
+        # flush already decoded the full response into the assistant message.
+        structured_history.messages.append(utils.ChatMessage('user', user_message))
+        structured_history.messages.append(
+            utils.ChatMessage('assistant', assistant_msg['content']))
+
+    def _structured_history_for(self,
+                                chat_history: utils.UnstructuredChatHistory,
+                                ) -> utils.ChatHistory:
+        """Returns the structured history mirroring the given raw history.
+
+        Normally the persistent instance already matches and is returned as is;
+        if the GUI state diverged (cleared chat, edited or retried messages),
+        the mirror is rebuilt from the raw history.
+        """
+
+        messages = self._structured_chat_history.messages
+
+        in_sync = len(messages) == len(chat_history) and (
+            not messages
+            or (messages[-1].role == chat_history[-1]['role']
+                and messages[-1].content == chat_history[-1]['content']))
+
+        if not in_sync:
+            self._structured_chat_history = utils.ChatHistory(
+                [utils.ChatMessage(message['role'], message['content'])
+                 for message in chat_history]
+            )
+
+        return self._structured_chat_history
 
     def _create_retrieved_docs_representation(self) -> gr.Markdown:
         """Concatenates the documents retrieved till now and returns their Markdown repr."""
 
-        retrieval_history_reprs: list[str] = []
+        if self._docs_dirty:
+            self._docs_md_cache = '\n---\n'.join(self._rendered_round_reprs)
+            self._docs_dirty = False
+
+        return gr.Markdown(self._docs_md_cache)
 
-        for docs in self._documents_retrieval_history:
+    def _render_docs_round(self,
+                           round_nr: int,
+                           context_docs: list[utils.ContextDocument]) -> str:
+        """Renders the Markdown block for a single retrieval round."""
 
-            docs_repr = (self._DOC_MD_TEMPLATE.format(title=doc.metadata['title'],
-                                                      content=doc.content)
-                         for doc in docs)
+        # Writing into one StringIO buffer skips the intermediate per-doc
+        # strings and the separate sizing pass str.join would need; rounds with
+        # many long documents render into a single growing buffer.
+        buffer = io.StringIO()
+        buffer.write(f'\n## Round {round_nr}\n\n')
 
-            retrieval_history_reprs.append('\n\n'.join(docs_repr))
+        for doc_nr, doc in enumerate(context_docs):
+            if doc_nr:
+                buffer.write('\n\n')
 
-        docs_list_repr = (self._DOCS_LIST_MD_TEMPLATE.format(round_nr=i + 1,
-                                                             docs=repr)
-                          for i, repr in enumerate(retrieval_history_reprs))
+            buffer.write(f'\n### {doc.metadata["title"]}\n\n{doc.content}\n')
 
-        return gr.Markdown('\n---\n'.join(docs_list_repr))
+        buffer.write('\n')
+
+        return buffer.getvalue()
 
     def _move_user_msg_to_chat(self,
                                user_message: str,
@@ -161,23 +271,38 @@ class MainController:
 
         chat_history, user_message = chat_history[:-1], chat_history[-1]['content']
 
-        gr.Info('Collecting context documents...', duration=5)
+        cache_key = (user_message,
+                     tuple((message['role'], hash(message['content']))
+                           for message in chat_history[-self._CTX_CACHE_KEY_HISTORY_LEN:]))
 
-        try:
-            context_docs = self._context_retriever_service.collect_context_info(
-                user_message=user_message,
-                chat_history=utils.ChatHistory(
-                    [utils.ChatMessage(message['role'], message['content'])
-                     for message in chat_history]
+        context_docs = self._ctx_cache.get(cache_key)
+
+        if context_docs is None:
+            gr.Info('Collecting context documents...', duration=5)
+
+            try:
+                context_docs = self._context_retriever_service.collect_context_info(
+                    user_message=user_message,
+                    chat_history=self._structured_history_for(chat_history)
                 )
-            )
 
-        except requests.HTTPError as e:
-            _logger().error('Failed to collect context info from backend: %s', e)
+            except requests.HTTPError as e:
+                _LOG.error('Failed to collect context info from backend: %s', e)
+
+                raise gr.Error('Failed to collect context info from backend.', duration=None)
 
-            raise gr.Error('Failed to collect context info from backend.', duration=None)
+            self._ctx_cache[cache_key] = context_docs
+
+            while len(self._ctx_cache) > self._CTX_CACHE_MAX_ENTRIES:
+                self._ctx_cache.popitem(last=False)
+
+        else:
+            self._ctx_cache.move_to_end(cache_key)
 
         self._documents_retrieval_history.append(context_docs)
+        self._rendered_round_reprs.append(
+            self._render_docs_round(len(self._documents_retrieval_history), context_docs))
+        self._docs_dirty = True
 
     def _validate_user_msg(self,
                            chat_history: utils.UnstructuredChatHistory,
@@ -186,15 +311,12 @@ class MainController:
 
         chat_history, user_message = chat_history[:-1], chat_history[-1]['content']
 
-        structured_history = utils.ChatHistory(
-            [utils.ChatMessage(message['role'], message['content'])
-             for message in chat_history]
-        )
+        structured_history = self._structured_history_for(chat_history)
 
         gr.Info('Validating user message...', duration=5)
 
         try:
-            safety_check = self._llm_proxy_service.check_input_safety(
+            safety_check, relevance_check = self._llm_proxy_service.check_input(
                 user_message, structured_history)
 
             if not safety_check.is_ok:
@@ -203,9 +325,6 @@ class MainController:
                                title='Input Safety Check Failed',
                                duration=None)
 
-            relevance_check = self._llm_proxy_service.check_input_relevance(
-                user_message, structured_history)
-
             if not relevance_check.is_ok:
                 yield chat_history
                 raise gr.Error(relevance_check.reason,
@@ -213,7 +332,7 @@ class MainController:
                                duration=None)
 
         except requests.HTTPError as e:
-            _logger().error('Failed to validate user message: %s', e)
+            _LOG.error('Failed to validate user message: %s', e)
 
             raise gr.Error('Failure while validating user message.', duration=None)
 
@@ -227,15 +346,19 @@ class MainController:
             upload_error = self._context_retriever_service.upload_file(uploaded_file_path)
 
         except requests.HTTPError as e:
-            _logger().error('Failed to upload file to context retriever: %s', e)
+            _LOG.error('Failed to upload file to context retriever: %s', e)
 
             raise gr.Error('Failed to upload a file.', duration=None)
 
         if upload_error is not None:
-            _logger().error('Failed to upload file to context retriever: %s', upload_error)
+            _LOG.error('Failed to upload file to context retriever: %s', upload_error)
 
             raise gr.Error(upload_error,
                            title='Failed to upload a file',
                            duration=None)
 
+        # The new document changes what retrieval may return, so cached
+        # results for previously asked questions are stale.
+        self._ctx_cache.clear()
+
         gr.Success('File uploaded successfully!', duration=5)